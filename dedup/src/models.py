@@ -1,7 +1,7 @@
 # File: models.py
 # Location: dedup/src/models.py
 # Purpose: Pydantic data models for deduplication pipeline
-# Dependencies: pydantic
+# Dependencies: pydantic, numpy, orjson, xxhash
 
 """
 Pydantic models for ib_insync documentation deduplication.
@@ -15,18 +15,53 @@ Size: Split into logical sections to maintain readability
 
 Example:
     >>> example = CodeExample.from_code("print('hello')")
-    >>> example.code_hash
-    '2cf24dba5fb0a30e26e83b2ac5b9e29e1b161e5c1fa7425e73043362938b9824'
+    >>> len(example.code_hash)
+    16
 """
 
-import hashlib
+import base64
+import heapq
+import re
+import sys
 import uuid
-from datetime import datetime
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
 from enum import Enum
+from itertools import chain
 from pathlib import Path
-from typing import Any, Dict, List, Optional
-
-from pydantic import BaseModel, Field, computed_field, field_validator
+from typing import (
+    Annotated,
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Literal,
+    Mapping,
+    Optional,
+    Tuple,
+    cast,
+)
+
+import numpy as np
+import orjson
+import xxhash
+from pydantic import (
+    BaseModel,
+    BeforeValidator,
+    ConfigDict,
+    Field,
+    PlainSerializer,
+    PrivateAttr,
+    WithJsonSchema,
+    field_serializer,
+    field_validator,
+)
+from typing_extensions import TypedDict
+
+# Python line comments, stripped during normalization
+_COMMENT_RE = re.compile(r"#.*$", re.MULTILINE)
 
 
 # =============================================================================
@@ -58,6 +93,11 @@ class LanguageType(str, Enum):
     UNKNOWN = "unknown"
 
 
+# LanguageType values as a Literal; pydantic checks these with a plain
+# string match instead of an enum lookup, so hot models use this type
+LanguageName = Literal["python", "bash", "javascript", "yaml", "json", "markdown", "unknown"]
+
+
 class MergeStrategy(str, Enum):
     """Strategy used for merging similar content."""
 
@@ -76,6 +116,8 @@ class MergeStrategy(str, Enum):
 class SourceLocation(BaseModel):
     """Tracks where content originated in source files."""
 
+    model_config = ConfigDict(frozen=True)
+
     file: str = Field(..., description="Source file path")
     line_start: int = Field(..., ge=0, description="Starting line number (0-indexed)")
     line_end: int = Field(..., ge=0, description="Ending line number (0-indexed)")
@@ -84,6 +126,12 @@ class SourceLocation(BaseModel):
         default_factory=list, description="Hierarchical heading path (e.g., ['API', 'Client', 'connect'])"
     )
 
+    @field_validator("file")
+    @classmethod
+    def intern_file(cls, v: str) -> str:
+        """Share one string object per distinct path across all locations."""
+        return sys.intern(v)
+
     @field_validator("line_end")
     @classmethod
     def validate_line_range(cls, v: int, info) -> int:
@@ -92,7 +140,6 @@ class SourceLocation(BaseModel):
             raise ValueError("line_end must be >= line_start")
         return v
 
-    @computed_field
     @property
     def line_count(self) -> int:
         """Number of lines in this location."""
@@ -104,15 +151,64 @@ class SourceLocation(BaseModel):
 # =============================================================================
 
 
+def _decode_vector(value: Any, dtype: type) -> np.ndarray:
+    """Decode a base64 string, raw bytes, list or array into a vector."""
+    if isinstance(value, str):
+        value = base64.b64decode(value)
+    if isinstance(value, (bytes, bytearray)):
+        return np.frombuffer(value, dtype=dtype).copy()
+    return np.asarray(value, dtype=dtype)
+
+
+def _to_base64(vector: np.ndarray) -> str:
+    """Encode a vector's raw bytes as base64 text."""
+    return base64.b64encode(vector.tobytes()).decode("ascii")
+
+
+_BASE64_SCHEMA = WithJsonSchema({"type": "string", "contentEncoding": "base64"})
+
+# Dense float32 vector in memory and in Python dumps, base64 text in JSON
+Embedding = Annotated[
+    np.ndarray,
+    BeforeValidator(lambda v: _decode_vector(v, np.float32)),
+    PlainSerializer(_to_base64, return_type=str, when_used="json"),
+    _BASE64_SCHEMA,
+]
+
+# Symmetric int8 vector in memory and in Python dumps, base64 text in JSON
+QuantizedEmbedding = Annotated[
+    np.ndarray,
+    BeforeValidator(lambda v: _decode_vector(v, np.int8)),
+    PlainSerializer(_to_base64, return_type=str, when_used="json"),
+    _BASE64_SCHEMA,
+]
+
+
+def _hash_from_hex(value: Any) -> Any:
+    """Accept a code hash as raw digest bytes or hex text."""
+    return bytes.fromhex(value) if isinstance(value, str) else value
+
+
+# Raw digest bytes in memory and in Python dumps, hex text in JSON
+CodeHash = Annotated[
+    bytes,
+    BeforeValidator(_hash_from_hex),
+    PlainSerializer(bytes.hex, return_type=str, when_used="json"),
+    WithJsonSchema({"type": "string", "contentEncoding": "base16"}),
+]
+
+
 class CodeExample(BaseModel):
     """Represents a code snippet extracted from documentation."""
 
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
     # Identity
     id: str = Field(default_factory=lambda: f"ex_{uuid.uuid4().hex[:12]}")
 
     # Content
     code: str = Field(..., description="Raw code content")
-    language: LanguageType = Field(default=LanguageType.PYTHON)
+    language: LanguageName = Field(default="python")
 
     # Context
     operation: Optional[str] = Field(None, description="Main operation (e.g., 'qualify_contracts', 'place_order')")
@@ -128,8 +224,10 @@ class CodeExample(BaseModel):
 
     # Deduplication metadata
     normalized_code: str = Field(..., description="Code with comments/whitespace removed")
-    code_hash: str = Field(..., description="Hash of normalized code for exact duplicate detection")
-    embedding: Optional[List[float]] = Field(None, description="Vector embedding for similarity comparison")
+    code_hash: CodeHash = Field(..., description="128-bit digest of normalized code for exact duplicate detection")
+    embedding: Optional[Embedding] = Field(None, description="Vector embedding (float32) for similarity comparison")
+    embedding_q8: Optional[QuantizedEmbedding] = Field(None, description="int8-quantized embedding")
+    embedding_scale: Optional[float] = Field(None, gt=0.0, description="Scale to dequantize embedding_q8")
 
     # Source tracking
     sources: List[SourceLocation] = Field(default_factory=list)
@@ -150,7 +248,7 @@ class CodeExample(BaseModel):
     def from_code(
         cls,
         code: str,
-        language: LanguageType = LanguageType.PYTHON,
+        language: LanguageName | LanguageType = "python",
         source: Optional[SourceLocation] = None,
         **kwargs,
     ) -> "CodeExample":
@@ -162,7 +260,8 @@ class CodeExample(BaseModel):
 
         return cls(
             code=code,
-            language=language,
+            # LanguageType members are str values, which the Literal accepts
+            language=cast(LanguageName, language),
             normalized_code=normalized,
             code_hash=code_hash,
             sources=sources,
@@ -175,27 +274,89 @@ class CodeExample(BaseModel):
         Normalize code by removing comments and standardizing whitespace.
         This allows detection of functionally identical code.
         """
-        import re
-
         # Remove Python comments (simple approach)
-        code = re.sub(r"#.*$", "", code, flags=re.MULTILINE)
+        code = _COMMENT_RE.sub("", code)
 
-        # Remove blank lines
-        lines = [line.rstrip() for line in code.split("\n") if line.strip()]
+        # Drop trailing whitespace and blank lines in one pass
+        # (preserve indentation structure)
+        lines = [stripped for line in code.splitlines() if (stripped := line.rstrip())]
 
-        # Standardize whitespace (preserve indentation structure)
         return "\n".join(lines)
 
     @staticmethod
-    def _hash_code(code: str) -> str:
-        """Generate SHA256 hash of code."""
-        return hashlib.sha256(code.encode("utf-8")).hexdigest()
+    def _hash_code(code: str) -> bytes:
+        """
+        Generate a 128-bit xxHash (XXH3) digest of code.
+
+        The hash is only used as a dedup key, so a fast non-cryptographic
+        hash is sufficient. The raw 16-byte digest is kept in memory and
+        hex-encoded only in JSON.
+        """
+        return xxhash.xxh3_128_digest(code.encode("utf-8"))
+
+    def quantize_embedding(self, drop_float: bool = False) -> None:
+        """
+        Store a symmetric int8 copy of the embedding.
+
+        Args:
+            drop_float: Discard the float32 embedding once quantized
+
+        Raises:
+            ValueError: If the example has no embedding
+        """
+        if self.embedding is None:
+            raise ValueError(f"Example {self.id} has no embedding")
+
+        peak = float(np.max(np.abs(self.embedding)))
+        scale = peak / 127 if peak > 0 else 1.0
+        self.embedding_q8 = np.round(self.embedding / scale).astype(np.int8)
+        self.embedding_scale = scale
+        if drop_float:
+            self.embedding = None
+
+    def similarity_q8(self, other: "CodeExample") -> float:
+        """
+        Approximate cosine similarity from the int8 embeddings.
+
+        The per-vector scales cancel out of the cosine, so only the integer
+        vectors are needed.
+
+        Raises:
+            ValueError: If either example has not been quantized
+        """
+        if self.embedding_q8 is None or other.embedding_q8 is None:
+            raise ValueError("Both examples must be quantized first")
+
+        a = self.embedding_q8.astype(np.int32)
+        b = other.embedding_q8.astype(np.int32)
+        norms = float(np.sqrt(int(a @ a) * int(b @ b)))
+        return int(a @ b) / norms if norms else 0.0
 
     def add_source(self, source: SourceLocation) -> None:
         """Add another source location for this example."""
         self.sources.append(source)
         self.occurrence_count += 1
 
+    def __eq__(self, other: object) -> bool:
+        """
+        Compare field by field, treating embedding arrays by value.
+
+        BaseModel compares the field dicts directly, which is ambiguous for
+        numpy arrays.
+        """
+        if not isinstance(other, BaseModel):
+            return NotImplemented
+        if type(self) is not type(other) or self.__dict__.keys() != other.__dict__.keys():
+            return False
+        return all(_values_equal(value, other.__dict__[name]) for name, value in self.__dict__.items())
+
+
+def _values_equal(a: Any, b: Any) -> bool:
+    """Equality that compares numpy arrays element-wise."""
+    if isinstance(a, np.ndarray) or isinstance(b, np.ndarray):
+        return isinstance(a, np.ndarray) and isinstance(b, np.ndarray) and np.array_equal(a, b)
+    return bool(a == b)
+
 
 # =============================================================================
 # Example Clusters
@@ -222,19 +383,50 @@ class ExampleCluster(BaseModel):
     merge_notes: Optional[str] = Field(None, description="Notes from AI merging process")
     conflicts: List[str] = Field(default_factory=list, description="Detected conflicts requiring review")
 
-    @computed_field
+    def variant_similarities(self) -> np.ndarray:
+        """
+        Cosine similarity of every variant to the canonical example.
+
+        Stacks variant embeddings into one matrix so the comparison is a
+        single matrix-vector product.
+
+        Raises:
+            ValueError: If the canonical or any variant has no embedding
+        """
+        if not self.variants:
+            return np.empty(0, dtype=np.float32)
+
+        canonical = self.canonical.embedding
+        if canonical is None:
+            raise ValueError(f"Cluster {self.cluster_id} has examples without embeddings")
+
+        matrix = self._variant_matrix()
+        norms = np.linalg.norm(matrix, axis=1) * np.linalg.norm(canonical)
+        similarities: np.ndarray = (matrix @ canonical) / np.maximum(norms, np.finfo(np.float32).tiny)
+        return similarities
+
+    def _variant_matrix(self) -> np.ndarray:
+        """
+        Stack the variant embeddings into one (N, D) matrix.
+
+        Raises:
+            ValueError: If any variant has no embedding
+        """
+        vectors = [v.embedding for v in self.variants if v.embedding is not None]
+        if len(vectors) != len(self.variants):
+            raise ValueError(f"Cluster {self.cluster_id} has examples without embeddings")
+        return np.stack(vectors)
+
     @property
     def total_occurrences(self) -> int:
         """Total times this example pattern appears across all sources."""
         return self.canonical.occurrence_count + sum(v.occurrence_count for v in self.variants)
 
-    @computed_field
     @property
     def variant_count(self) -> int:
         """Number of variants (not including canonical)."""
         return len(self.variants)
 
-    @computed_field
     @property
     def unique_sources(self) -> List[str]:
         """List of unique source files for this cluster."""
@@ -255,6 +447,8 @@ class ExampleCluster(BaseModel):
 class APIParameter(BaseModel):
     """Parameter for an API method."""
 
+    model_config = ConfigDict(frozen=True)
+
     name: str
     type: Optional[str] = None
     default: Optional[str] = None
@@ -303,6 +497,8 @@ class APIMethod(BaseModel):
 class Pattern(BaseModel):
     """Identified usage pattern or best practice."""
 
+    model_config = ConfigDict(frozen=True)
+
     id: str = Field(default_factory=lambda: f"pattern_{uuid.uuid4().hex[:12]}")
     name: str
     category: str  # e.g., "connection", "data_retrieval", "order_management"
@@ -317,6 +513,8 @@ class Pattern(BaseModel):
 class Concept(BaseModel):
     """Conceptual explanation or tutorial content."""
 
+    model_config = ConfigDict(frozen=True)
+
     id: str = Field(default_factory=lambda: f"concept_{uuid.uuid4().hex[:12]}")
     title: str
     content: str
@@ -330,6 +528,8 @@ class Concept(BaseModel):
 class Gotcha(BaseModel):
     """Common pitfall or warning."""
 
+    model_config = ConfigDict(frozen=True)
+
     id: str = Field(default_factory=lambda: f"gotcha_{uuid.uuid4().hex[:12]}")
     title: str
     description: str
@@ -340,10 +540,56 @@ class Gotcha(BaseModel):
     sources: List[SourceLocation] = Field(default_factory=list)
 
 
+# =============================================================================
+# JSON Streaming
+# =============================================================================
+
+# Write buffer for streamed JSON; many small entry writes become few syscalls
+_WRITE_BUFFER_SIZE = 128 * 1024
+
+
+def _json_object(entries: Iterable[Tuple[str, Iterable[bytes]]]) -> Iterator[bytes]:
+    """
+    Yield a JSON object chunk by chunk.
+
+    Each entry is a key plus the encoded chunks of its value, so large
+    values can themselves be streamed without building them in memory.
+    """
+    yield b"{"
+    separator = b"\n"
+    for key, value_chunks in entries:
+        yield separator + orjson.dumps(key) + b": "
+        yield from value_chunks
+        separator = b",\n"
+    yield b"\n}"
+
+
+def _model_entries(models: Mapping[str, BaseModel]) -> Iterator[Tuple[str, Iterable[bytes]]]:
+    """Encode each model of a mapping on demand, straight to JSON bytes."""
+    for key, model in models.items():
+        yield key, (model.__pydantic_serializer__.to_json(model),)
+
+
+def _write_json_object(path: Path, entries: Iterable[Tuple[str, Iterable[bytes]]]) -> None:
+    """Stream a JSON object to disk through a large write buffer."""
+    with open(path, "wb", buffering=_WRITE_BUFFER_SIZE) as f:
+        f.writelines(_json_object(entries))
+
+
 # =============================================================================
 # Complete Database
 # =============================================================================
 
+# Model mappings written entry by entry by DedupDatabase.save_json
+_STREAMED_DB_FIELDS = (
+    "api_methods",
+    "example_clusters",
+    "standalone_examples",
+    "concepts",
+    "patterns",
+    "gotchas",
+)
+
 
 class DedupMetrics(BaseModel):
     """Metrics tracking deduplication results."""
@@ -385,7 +631,7 @@ class DedupDatabase(BaseModel):
 
     # Metadata
     version: str = "1.0.0"
-    created_at: datetime = Field(default_factory=datetime.now)
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     source_files: List[str] = Field(default_factory=list)
 
     # Content
@@ -399,31 +645,68 @@ class DedupDatabase(BaseModel):
     # Metrics
     metrics: DedupMetrics = Field(default_factory=DedupMetrics)
 
+    @field_validator("created_at", mode="before")
+    @classmethod
+    def parse_created_at(cls, v: Any) -> Any:
+        """Accept epoch seconds (UTC) as well as ISO strings and datetimes."""
+        if isinstance(v, (int, float)):
+            return datetime.fromtimestamp(v, tz=timezone.utc)
+        return v
+
+    @field_serializer("created_at", when_used="json")
+    def serialize_created_at(self, v: datetime) -> float | str:
+        """
+        Write created_at as epoch seconds.
+
+        A naive datetime has no fixed instant, so it keeps its ISO form.
+        """
+        if v.tzinfo is None:
+            return v.isoformat()
+        return v.timestamp()
+
+    # Canonical example ID -> cluster ID, kept current by add_example_cluster()
+    _canonical_index: Dict[str, str] = PrivateAttr(default_factory=dict)
+
+    def model_post_init(self, __context: Any) -> None:
+        """Index canonical examples of loaded clusters."""
+        for cluster in self.example_clusters.values():
+            self._canonical_index[cluster.canonical.id] = cluster.cluster_id
+
     # Methods
     def save_json(self, path: Path | str) -> None:
-        """Save database to JSON file."""
+        """
+        Save database to JSON file.
+
+        Model mappings are encoded and written one entry at a time, so peak
+        memory stays close to the size of the largest single entry.
+        """
         path = Path(path)
         path.parent.mkdir(parents=True, exist_ok=True)
 
-        with open(path, "w", encoding="utf-8") as f:
-            f.write(self.model_dump_json(indent=2))
+        header = self.model_dump(mode="json", exclude=set(_STREAMED_DB_FIELDS))
+        entries = chain(
+            ((key, (orjson.dumps(value),)) for key, value in header.items()),
+            ((name, _json_object(_model_entries(getattr(self, name)))) for name in _STREAMED_DB_FIELDS),
+        )
+        _write_json_object(path, entries)
 
     @classmethod
     def load_json(cls, path: Path | str) -> "DedupDatabase":
         """Load database from JSON file."""
-        path = Path(path)
-        with open(path, encoding="utf-8") as f:
-            import json
-
-            return cls(**json.load(f))
+        return cls.model_validate_json(Path(path).read_bytes())
 
     def add_api_method(self, method: APIMethod) -> None:
         """Add or update an API method."""
         self.api_methods[method.full_path] = method
 
     def add_example_cluster(self, cluster: ExampleCluster) -> None:
-        """Add an example cluster."""
+        """Add an example cluster, replacing any cluster with the same ID."""
+        replaced = self.example_clusters.get(cluster.cluster_id)
+        if replaced is not None:
+            self._canonical_index.pop(replaced.canonical.id, None)
+
         self.example_clusters[cluster.cluster_id] = cluster
+        self._canonical_index[cluster.canonical.id] = cluster.cluster_id
 
     def add_standalone_example(self, example: CodeExample) -> None:
         """Add a standalone example (no duplicates)."""
@@ -437,25 +720,67 @@ class DedupDatabase(BaseModel):
 
         examples = []
         for example_id in method.example_ids:
-            # Check standalone examples
-            if example_id in self.standalone_examples:
-                examples.append(self.standalone_examples[example_id])
-
-            # Check clusters
-            for cluster in self.example_clusters.values():
-                if cluster.canonical.id == example_id:
-                    examples.append(cluster.canonical)
-                    break
+            example = self._find_example(example_id)
+            if example is not None:
+                examples.append(example)
 
         return examples
 
-    @computed_field
+    def embeddings_matrix(self) -> Tuple[List[str], np.ndarray]:
+        """
+        Stack every example embedding into one (N, D) float32 matrix.
+
+        Covers canonicals, variants and standalone examples; examples
+        without an embedding are skipped. Row i belongs to ids[i], so
+        similarity search can run as a single matrix product.
+
+        Returns:
+            Tuple of (example IDs, embedding matrix)
+        """
+        examples = chain(
+            *([c.canonical, *c.variants] for c in self.example_clusters.values()),
+            self.standalone_examples.values(),
+        )
+        ids: List[str] = []
+        vectors: List[np.ndarray] = []
+        for example in examples:
+            if example.embedding is not None:
+                ids.append(example.id)
+                vectors.append(example.embedding)
+
+        if not vectors:
+            return ids, np.empty((0, 0), dtype=np.float32)
+        return ids, np.vstack(vectors)
+
+    def _find_example(self, example_id: str) -> Optional[CodeExample]:
+        """
+        Look up a standalone or canonical example by ID.
+
+        Canonicals are found through the index first. A miss or a stale
+        entry falls back to scanning the clusters, which covers canonicals
+        replaced after their cluster was added and clusters stored directly
+        in example_clusters.
+        """
+        if example_id in self.standalone_examples:
+            return self.standalone_examples[example_id]
+
+        cluster = self.example_clusters.get(self._canonical_index.get(example_id, ""))
+        if cluster is not None and cluster.canonical.id == example_id:
+            return cluster.canonical
+        return self._scan_canonicals(example_id)
+
+    def _scan_canonicals(self, example_id: str) -> Optional[CodeExample]:
+        """Find a canonical example by scanning every cluster."""
+        for cluster in self.example_clusters.values():
+            if cluster.canonical.id == example_id:
+                return cluster.canonical
+        return None
+
     @property
     def total_examples(self) -> int:
         """Total number of canonical examples."""
         return len(self.example_clusters) + len(self.standalone_examples)
 
-    @computed_field
     @property
     def total_variants(self) -> int:
         """Total number of variant examples."""
@@ -512,22 +837,19 @@ class MergingOutput(BaseModel):
 # =============================================================================
 
 
-class OperationIndex(BaseModel):
-    """Index entry for an operation in the apex index."""
-
-    canonical_id: str = Field(..., description="ID of canonical example")
-    total_occurrences: int = Field(..., ge=1)
-    variant_count: int = Field(default=0, ge=0)
-    confidence: float = Field(default=1.0, ge=0.0, le=1.0)
+class OperationIndex(TypedDict):
+    """
+    Index entry for an operation in the apex index.
 
-    tier_distribution: Dict[str, int] = Field(
-        default_factory=dict,
-        description="Count of examples per tier (a0, a1, a2, a3)",
-    )
+    A plain dict so only the enclosing ApexIndex pays model overhead.
+    """
 
-    file_pointer: str = Field(
-        ..., description="JSON pointer to canonical example"
-    )
+    canonical_id: str
+    total_occurrences: Annotated[int, Field(ge=1)]
+    variant_count: Annotated[int, Field(ge=0)]
+    confidence: Annotated[float, Field(ge=0.0, le=1.0)]
+    tier_distribution: Dict[str, int]  # Count per tier (a0, a1, a2, a3)
+    file_pointer: str  # JSON pointer to canonical example
 
 
 class ApexIndex(BaseModel):
@@ -559,19 +881,19 @@ class ApexIndex(BaseModel):
         self, operation: str, canonical_id: str, cluster: "ExampleCluster"
     ) -> None:
         """Add operation to apex index."""
-        tier_dist = {"a0": cluster.canonical.occurrence_count}
+        tier_dist = Counter({"a0": cluster.canonical.occurrence_count})
 
         for variant in cluster.variants:
-            tier = variant.tier or "a1"
-            tier_dist[tier] = tier_dist.get(tier, 0) + variant.occurrence_count
-
-        self.operations[operation] = OperationIndex(
-            canonical_id=canonical_id,
-            total_occurrences=cluster.total_occurrences,
-            variant_count=cluster.variant_count,
-            tier_distribution=tier_dist,
-            file_pointer=f"canonical_examples.json#{canonical_id}",
-        )
+            tier_dist[variant.tier or "a1"] += variant.occurrence_count
+
+        self.operations[operation] = {
+            "canonical_id": canonical_id,
+            "total_occurrences": cluster.total_occurrences,
+            "variant_count": cluster.variant_count,
+            "confidence": 1.0,
+            "tier_distribution": dict(tier_dist),
+            "file_pointer": f"canonical_examples.json#{canonical_id}",
+        }
 
         self.total_operations = len(self.operations)
 
@@ -579,38 +901,44 @@ class ApexIndex(BaseModel):
         """Save apex index to JSON."""
         path = Path(path)
         path.parent.mkdir(parents=True, exist_ok=True)
-        with open(path, "w", encoding="utf-8") as f:
-            f.write(self.model_dump_json(indent=2))
+        with open(path, "wb") as f:
+            f.write(orjson.dumps(self.model_dump(mode="json"), option=orjson.OPT_INDENT_2))
 
     @classmethod
     def load_json(cls, path: Path | str) -> "ApexIndex":
         """Load apex index from JSON."""
-        path = Path(path)
-        with open(path, encoding="utf-8") as f:
-            import json
-
-            return cls(**json.load(f))
+        return cls.model_validate_json(Path(path).read_bytes())
 
 
-class TierInfo(BaseModel):
+class TierInfo(TypedDict):
     """Information about a specific tier in a cluster."""
 
     example_id: str
-    occurrences: int = Field(..., ge=1)
-    similarity: float = Field(..., ge=0.0, le=1.0)
-    pointer: Optional[str] = None
-    diff_summary: Optional[str] = None
-    unique_information: List[str] = Field(default_factory=list)
+    occurrences: int  # >= 1
+    similarity: float  # 0.0 to 1.0
+    pointer: Optional[str]
+    diff_summary: Optional[str]
+    unique_information: List[str]
 
 
-class ClusterNavigation(BaseModel):
+class ClusterNavigation(TypedDict):
     """Navigation pointers for cluster traversal."""
 
-    parent: str = Field(..., description="Pointer to apex index entry")
-    canonical: str = Field(..., description="Pointer to canonical example")
-    variants: Dict[str, int] = Field(
-        default_factory=dict, description="Count per tier"
-    )
+    parent: str  # Pointer to apex index entry
+    canonical: str  # Pointer to canonical example
+    variants: Dict[str, int]  # Count per tier
+
+
+def _variant_tier_counts(tiers: Dict[str, Any]) -> Dict[str, int]:
+    """Count variants per non-empty tier (the tier set is fixed)."""
+    counts: Dict[str, int] = {}
+    if tiers["a1"]:
+        counts["a1"] = len(tiers["a1"])
+    if tiers["a2"]:
+        counts["a2"] = len(tiers["a2"])
+    if tiers["a3"]:
+        counts["a3"] = len(tiers["a3"])
+    return counts
 
 
 class VariantCluster(BaseModel):
@@ -637,13 +965,16 @@ class VariantCluster(BaseModel):
         cls, cluster: ExampleCluster, operation: str
     ) -> "VariantCluster":
         """Convert ExampleCluster to VariantCluster for pyramid index."""
+        a0: TierInfo = {
+            "example_id": cluster.canonical.id,
+            "occurrences": cluster.canonical.occurrence_count,
+            "similarity": 1.0,
+            "pointer": f"canonical_examples.json#{cluster.canonical.id}",
+            "diff_summary": None,
+            "unique_information": [],
+        }
         tiers: Dict[str, Any] = {
-            "a0": TierInfo(
-                example_id=cluster.canonical.id,
-                occurrences=cluster.canonical.occurrence_count,
-                similarity=1.0,
-                pointer=f"canonical_examples.json#{cluster.canonical.id}",
-            ).model_dump(),
+            "a0": a0,
             "a1": [],
             "a2": [],
             "a3": [],
@@ -652,14 +983,15 @@ class VariantCluster(BaseModel):
         # Organize variants by tier
         for variant in cluster.variants:
             tier = variant.tier or "a1"
-            tier_info = TierInfo(
-                example_id=variant.id,
-                occurrences=variant.occurrence_count,
-                similarity=variant.similarity_to_canonical or 0.85,
-                diff_summary=variant.diff_summary,
-                unique_information=variant.unique_information,
-            )
-            tiers[tier].append(tier_info.model_dump())
+            tier_info: TierInfo = {
+                "example_id": variant.id,
+                "occurrences": variant.occurrence_count,
+                "similarity": variant.similarity_to_canonical or 0.85,
+                "pointer": None,
+                "diff_summary": variant.diff_summary,
+                "unique_information": list(variant.unique_information),
+            }
+            tiers[tier].append(tier_info)
 
         return cls(
             cluster_id=cluster.cluster_id,
@@ -667,15 +999,11 @@ class VariantCluster(BaseModel):
             canonical_id=cluster.canonical.id,
             total_occurrences=cluster.total_occurrences,
             tiers=tiers,
-            navigation=ClusterNavigation(
-                parent=f"apex_index.json#{operation}",
-                canonical=f"canonical_examples.json#{cluster.canonical.id}",
-                variants={
-                    tier: len(examples)
-                    for tier, examples in tiers.items()
-                    if tier != "a0" and examples
-                },
-            ),
+            navigation={
+                "parent": f"apex_index.json#{operation}",
+                "canonical": f"canonical_examples.json#{cluster.canonical.id}",
+                "variants": _variant_tier_counts(tiers),
+            },
         )
 
 
@@ -717,17 +1045,17 @@ class PyramidIndex(BaseModel):
     def _calculate_stats(self, db: "DedupDatabase") -> None:
         """Calculate quick statistics for apex index."""
         # Most common operations
-        ops_by_count = sorted(
+        top_ops = heapq.nlargest(
+            10,
             self.apex.operations.items(),
-            key=lambda x: x[1].total_occurrences,
-            reverse=True,
+            key=lambda x: x[1]["total_occurrences"],
         )
-        self.apex.quick_stats["most_common"] = [op for op, _ in ops_by_count[:10]]
+        self.apex.quick_stats["most_common"] = [op for op, _ in top_ops]
 
         # Average variants
         if self.apex.total_operations > 0:
             avg_variants = sum(
-                op.variant_count for op in self.apex.operations.values()
+                op["variant_count"] for op in self.apex.operations.values()
             ) / self.apex.total_operations
             self.apex.quick_stats["avg_variants_per_operation"] = round(
                 avg_variants, 2
@@ -740,40 +1068,46 @@ class PyramidIndex(BaseModel):
             )
 
     def save(self, output_dir: Path | str) -> None:
-        """Save pyramid index to separate files."""
+        """
+        Save pyramid index to separate files.
+
+        The three files are written concurrently so encoding one overlaps
+        with OS writeback of the others.
+        """
         output_dir = Path(output_dir)
         output_dir.mkdir(parents=True, exist_ok=True)
 
-        # Save apex (small, fast)
-        self.apex.save_json(output_dir / "apex_index.json")
-
-        # Save canonicals
-        canonical_data = {
-            "version": self.version,
-            "tier": "a0",
-            "count": len(self.canonicals),
-            "examples": {
-                ex_id: ex.model_dump() for ex_id, ex in self.canonicals.items()
-            },
-        }
-        with open(output_dir / "canonical_examples.json", "w", encoding="utf-8") as f:
-            import json
-
-            json.dump(canonical_data, f, indent=2, default=str)
-
-        # Save variant clusters
-        cluster_data = {
-            "version": self.version,
-            "count": len(self.clusters),
-            "clusters": {
-                c_id: cluster.model_dump()
-                for c_id, cluster in self.clusters.items()
-            },
-        }
-        with open(output_dir / "variant_clusters.json", "w", encoding="utf-8") as f:
-            import json
-
-            json.dump(cluster_data, f, indent=2, default=str)
+        # Canonicals, streamed one example at a time
+        canonical_entries = [
+            ("version", (orjson.dumps(self.version),)),
+            ("tier", (orjson.dumps("a0"),)),
+            ("count", (orjson.dumps(len(self.canonicals)),)),
+            ("examples", _json_object(_model_entries(self.canonicals))),
+        ]
+
+        # Variant clusters, streamed one cluster at a time
+        cluster_entries = [
+            ("version", (orjson.dumps(self.version),)),
+            ("count", (orjson.dumps(len(self.clusters)),)),
+            ("clusters", _json_object(_model_entries(self.clusters))),
+        ]
+
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            futures = [
+                pool.submit(self.apex.save_json, output_dir / "apex_index.json"),
+                pool.submit(
+                    _write_json_object,
+                    output_dir / "canonical_examples.json",
+                    canonical_entries,
+                ),
+                pool.submit(
+                    _write_json_object,
+                    output_dir / "variant_clusters.json",
+                    cluster_entries,
+                ),
+            ]
+            for future in futures:
+                future.result()
 
     @classmethod
     def load(cls, output_dir: Path | str) -> "PyramidIndex":
@@ -784,23 +1118,17 @@ class PyramidIndex(BaseModel):
         apex = ApexIndex.load_json(output_dir / "apex_index.json")
 
         # Load canonicals
-        with open(output_dir / "canonical_examples.json", encoding="utf-8") as f:
-            import json
-
-            canonical_data = json.load(f)
-            canonicals = {
-                ex_id: CodeExample(**ex_data)
-                for ex_id, ex_data in canonical_data["examples"].items()
-            }
+        canonical_data = orjson.loads((output_dir / "canonical_examples.json").read_bytes())
+        canonicals = {
+            ex_id: CodeExample(**ex_data)
+            for ex_id, ex_data in canonical_data["examples"].items()
+        }
 
         # Load clusters
-        with open(output_dir / "variant_clusters.json", encoding="utf-8") as f:
-            import json
-
-            cluster_data = json.load(f)
-            clusters = {
-                c_id: VariantCluster(**c_data)
-                for c_id, c_data in cluster_data["clusters"].items()
-            }
+        cluster_data = orjson.loads((output_dir / "variant_clusters.json").read_bytes())
+        clusters = {
+            c_id: VariantCluster(**c_data)
+            for c_id, c_data in cluster_data["clusters"].items()
+        }
 
         return cls(apex=apex, canonicals=canonicals, clusters=clusters)
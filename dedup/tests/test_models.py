@@ -0,0 +1,459 @@
+# File: test_models.py
+# Location: dedup/tests/test_models.py
+# Purpose: Test data models and serialization helpers
+# Dependencies: pytest, numpy, orjson
+
+"""
+Tests for models module.
+
+Tests cover:
+- Code normalization, hashing and language names
+- Embedding storage, codecs, quantization and equality
+- Derived cluster views and canonical lookup
+- Streamed JSON writing
+- Database save/load round-trips and older files
+- Pyramid index save/load
+"""
+
+import base64
+from datetime import datetime, timedelta, timezone
+from typing import get_args
+
+import numpy as np
+import orjson
+import pytest
+from pydantic import ValidationError
+
+from dedup.src import models
+from dedup.src.models import (
+    ApexIndex,
+    CodeExample,
+    DedupDatabase,
+    ExampleCluster,
+    LanguageName,
+    LanguageType,
+    PyramidIndex,
+    SourceLocation,
+    VariantCluster,
+)
+
+
+def _source(file: str) -> SourceLocation:
+    """Build a one-line source location."""
+    return SourceLocation(file=file, line_start=0, line_end=0)
+
+
+def _cluster(cluster_id: str = "cluster_1", operation: str = "connect") -> ExampleCluster:
+    """Build a cluster with one embedded canonical and one variant."""
+    canonical = CodeExample.from_code(
+        "ib.connect()", source=_source("a.md"), embedding=np.array([1.0, 0.0], dtype=np.float32)
+    )
+    variant = CodeExample.from_code(
+        "ib.connect('127.0.0.1')", source=_source("b.md"), embedding=np.array([0.6, 0.8], dtype=np.float32)
+    )
+    return ExampleCluster(
+        cluster_id=cluster_id,
+        canonical=canonical,
+        variants=[variant],
+        operation=operation,
+        avg_similarity=0.9,
+    )
+
+
+# =============================================================================
+# Normalization and Hashing
+# =============================================================================
+
+
+def test_code_hash_ignores_comments_and_trailing_whitespace():
+    """Functionally identical code hashes the same."""
+    assert CodeExample.from_code("x = 1  # a\n\n").code_hash == CodeExample.from_code("x = 1").code_hash
+
+
+def test_normalize_code_keeps_indentation():
+    """Blank lines go, indentation stays."""
+    assert CodeExample._normalize_code("if x:\n\n    y()  # call\n") == "if x:\n    y()"
+
+
+def test_code_hash_is_bytes_in_python_and_hex_in_json():
+    """code_hash stays raw bytes in model_dump and becomes hex in JSON."""
+    example = CodeExample.from_code("x = 1  # note\n")
+
+    dumped = example.model_dump()
+    encoded = orjson.loads(example.model_dump_json())
+
+    assert dumped["code_hash"] == example.code_hash
+    assert len(example.code_hash) == 16
+    assert encoded["code_hash"] == example.code_hash.hex()
+
+
+def test_language_name_matches_language_type():
+    """The Literal and the enum list the same languages."""
+    assert set(get_args(LanguageName)) == {member.value for member in LanguageType}
+
+
+def test_from_code_accepts_language_enum_members():
+    """LanguageType members validate against the Literal field."""
+    example = CodeExample.from_code("echo hi", language=LanguageType.BASH)
+
+    assert example.language == "bash"
+    assert orjson.loads(example.model_dump_json())["language"] == "bash"
+
+
+def test_language_rejects_unknown_names():
+    """Names outside the Literal fail validation."""
+    with pytest.raises(ValidationError):
+        CodeExample.from_code("x", language="ruby")
+
+
+# =============================================================================
+# Embeddings, Quantization and Equality
+# =============================================================================
+
+
+def test_embedding_accepts_list_as_float32():
+    """List embeddings are coerced to float32 arrays."""
+    example = CodeExample.from_code("x = 1", embedding=[1.0, 2.0])
+
+    assert isinstance(example.embedding, np.ndarray)
+    assert example.embedding.dtype == np.float32
+
+
+def test_embedding_encodes_base64_only_in_json():
+    """Embeddings stay arrays in model_dump and become base64 in JSON."""
+    example = CodeExample.from_code("x = 1", embedding=[1.0, 2.0])
+
+    encoded = orjson.loads(example.model_dump_json())
+
+    assert isinstance(example.model_dump()["embedding"], np.ndarray)
+    decoded = np.frombuffer(base64.b64decode(encoded["embedding"]), dtype=np.float32)
+    np.testing.assert_array_equal(decoded, [1.0, 2.0])
+
+
+def test_json_round_trip_preserves_example():
+    """A JSON round-trip reproduces an equal example, embeddings included."""
+    example = CodeExample.from_code("x = 1", embedding=[0.5, -0.25])
+    example.quantize_embedding()
+
+    restored = CodeExample.model_validate_json(example.model_dump_json())
+
+    assert restored == example
+    assert restored.embedding_q8.dtype == np.int8
+
+
+def test_example_equality_compares_embeddings_by_value():
+    """Equality works with ndarray fields instead of raising."""
+    example = CodeExample.from_code("x = 1", embedding=[1.0, 2.0])
+    changed = example.model_copy(deep=True)
+    changed.embedding = np.array([1.0, 3.0], dtype=np.float32)
+
+    assert example == example.model_copy(deep=True)
+    assert example != changed
+
+
+def test_quantize_embedding_scales_to_int8_range():
+    """The largest component maps to 127 and the scale recovers it."""
+    example = CodeExample.from_code("x = 1", embedding=[0.5, -0.25, 0.0])
+
+    example.quantize_embedding()
+
+    assert example.embedding_q8.tolist() == [127, -64, 0]
+    assert example.embedding_q8[0] * example.embedding_scale == pytest.approx(0.5)
+
+
+def test_quantize_embedding_can_drop_float_vector():
+    """drop_float discards the float32 embedding."""
+    example = CodeExample.from_code("x = 1", embedding=[1.0, 2.0])
+
+    example.quantize_embedding(drop_float=True)
+
+    assert example.embedding is None
+    assert example.embedding_q8 is not None
+
+
+def test_quantize_embedding_requires_embedding():
+    """Quantizing without an embedding raises."""
+    with pytest.raises(ValueError):
+        CodeExample.from_code("x = 1").quantize_embedding()
+
+
+def test_similarity_q8_matches_float_cosine():
+    """int8 cosine approximates the float cosine."""
+    a = CodeExample.from_code("a", embedding=[1.0, 0.0])
+    b = CodeExample.from_code("b", embedding=[0.6, 0.8])
+    a.quantize_embedding()
+    b.quantize_embedding()
+
+    assert a.similarity_q8(b) == pytest.approx(0.6, abs=0.01)
+
+
+def test_similarity_q8_requires_quantized_examples():
+    """Comparing unquantized examples raises."""
+    a = CodeExample.from_code("a", embedding=[1.0, 0.0])
+
+    with pytest.raises(ValueError):
+        a.similarity_q8(a)
+
+
+# =============================================================================
+# Clusters
+# =============================================================================
+
+
+def test_variant_similarities_uses_cosine():
+    """Variant similarity is the cosine to the canonical embedding."""
+    np.testing.assert_allclose(_cluster().variant_similarities(), [0.6], rtol=1e-6)
+
+
+def test_variant_similarities_requires_embeddings():
+    """A variant without an embedding raises."""
+    cluster = _cluster()
+    cluster.variants.append(CodeExample.from_code("ib.sleep(1)"))
+
+    with pytest.raises(ValueError):
+        cluster.variant_similarities()
+
+
+def test_derived_views_are_not_dumped():
+    """Counts and source lists are computed on access, not serialized."""
+    cluster = _cluster()
+
+    dumped = cluster.model_dump()
+
+    assert cluster.variant_count == 1
+    assert "variant_count" not in dumped
+    assert "unique_sources" not in dumped
+
+
+def test_unique_sources_tracks_every_mutation():
+    """unique_sources reflects sources added after construction."""
+    cluster = _cluster()
+
+    cluster.canonical.add_source(_source("c.md"))
+    cluster.variants.append(CodeExample.from_code("ib.sleep(1)", source=_source("d.md")))
+
+    assert cluster.unique_sources == ["a.md", "b.md", "c.md", "d.md"]
+
+
+def test_total_variants_counts_variants_added_later():
+    """total_variants includes variants added after the cluster was stored."""
+    db = DedupDatabase()
+    cluster = _cluster()
+    db.add_example_cluster(cluster)
+
+    cluster.variants.append(CodeExample.from_code("ib.sleep(1)"))
+
+    assert db.total_variants == 2
+
+
+def test_replacing_cluster_unindexes_old_canonical():
+    """A replaced cluster's canonical is no longer found by ID."""
+    db = DedupDatabase()
+    old = _cluster()
+    new = _cluster()
+    db.add_example_cluster(old)
+
+    db.add_example_cluster(new)
+
+    assert db._find_example(old.canonical.id) is None
+    assert db._find_example(new.canonical.id) is new.canonical
+
+
+def test_find_example_sees_canonicals_changed_outside_the_index():
+    """Reassigned canonicals and directly stored clusters are still found."""
+    db = DedupDatabase()
+    cluster = _cluster()
+    db.add_example_cluster(cluster)
+    old_canonical = cluster.canonical
+    cluster.canonical = CodeExample.from_code("ib.run()")
+    direct = _cluster(cluster_id="cluster_2")
+    db.example_clusters[direct.cluster_id] = direct
+
+    assert db._find_example(old_canonical.id) is None
+    assert db._find_example(cluster.canonical.id) is cluster.canonical
+    assert db._find_example(direct.canonical.id) is direct.canonical
+
+
+def test_find_example_after_model_copy_update():
+    """model_copy(update=...) keeps a stale index but lookups stay correct."""
+    db = DedupDatabase()
+    db.add_example_cluster(_cluster())
+    replacement = _cluster()
+
+    copied = db.model_copy(update={"example_clusters": {"cluster_1": replacement}})
+
+    assert copied._find_example(replacement.canonical.id) is replacement.canonical
+
+
+def test_embeddings_matrix_stacks_all_examples():
+    """Every embedded example gets a row; examples without one are skipped."""
+    db = DedupDatabase()
+    db.add_example_cluster(_cluster())
+    db.add_standalone_example(CodeExample.from_code("ib.disconnect()"))
+
+    ids, matrix = db.embeddings_matrix()
+
+    assert len(ids) == 2
+    assert matrix.shape == (2, 2)
+    assert matrix.dtype == np.float32
+
+
+# =============================================================================
+# Streamed JSON
+# =============================================================================
+
+
+def test_json_object_streams_valid_json():
+    """Chunks from _json_object join into the expected object."""
+    entries = [("a", (b"1",)), ("b", models._json_object([("c", (b"[]",))]))]
+
+    encoded = b"".join(models._json_object(entries))
+
+    assert orjson.loads(encoded) == {"a": 1, "b": {"c": []}}
+
+
+def test_json_object_handles_no_entries():
+    """An empty entry list yields an empty object."""
+    assert orjson.loads(b"".join(models._json_object([]))) == {}
+
+
+# =============================================================================
+# Database Persistence
+# =============================================================================
+
+
+def test_database_save_load_round_trip(tmp_path):
+    """A saved database loads back into an equal database."""
+    db = DedupDatabase()
+    db.add_example_cluster(_cluster())
+    db.add_standalone_example(CodeExample.from_code("ib.disconnect()"))
+    path = tmp_path / "db.json"
+
+    db.save_json(path)
+    restored = DedupDatabase.load_json(path)
+
+    assert restored == db
+    assert restored.total_variants == 1
+
+
+@pytest.mark.parametrize(
+    "created_at",
+    [
+        datetime(2025, 11, 15, 12, 0, 0, 500000, tzinfo=timezone.utc),
+        datetime(2025, 11, 15, 14, 0, tzinfo=timezone(timedelta(hours=2))),
+        datetime(2025, 11, 15, 12, 0),
+    ],
+)
+def test_created_at_round_trips(tmp_path, created_at):
+    """Aware timestamps round-trip as epoch seconds, naive ones as ISO text."""
+    db = DedupDatabase(created_at=created_at)
+    path = tmp_path / "db.json"
+
+    db.save_json(path)
+    restored = DedupDatabase.load_json(path)
+
+    assert restored == db
+    assert (restored.created_at.tzinfo is None) == (created_at.tzinfo is None)
+
+
+def test_created_at_defaults_to_utc():
+    """New databases are stamped with an aware UTC time."""
+    assert DedupDatabase().created_at.tzinfo is timezone.utc
+
+
+def test_created_at_accepts_iso_and_epoch():
+    """Older ISO files and epoch numbers both load."""
+    from_iso = DedupDatabase.model_validate_json('{"created_at": "2025-11-15T12:00:00Z"}')
+    from_epoch = DedupDatabase.model_validate_json('{"created_at": 1763208000}')
+
+    assert from_iso.created_at == from_epoch.created_at
+
+
+def test_source_location_is_frozen():
+    """Leaf models reject mutation after creation."""
+    with pytest.raises(ValidationError):
+        _source("a.md").file = "b.md"
+
+
+def test_source_location_interns_file_paths():
+    """Equal paths parsed separately share one string object."""
+    first = SourceLocation.model_validate_json('{"file": "docs/api.md", "line_start": 0, "line_end": 1}')
+    second = SourceLocation.model_validate_json('{"file": "docs/api.md", "line_start": 2, "line_end": 3}')
+
+    assert first.file is second.file
+
+
+def test_database_loads_files_with_derived_fields(tmp_path):
+    """Files carrying dumped derived fields such as line_count still load."""
+    db = DedupDatabase()
+    db.add_example_cluster(_cluster())
+    data = orjson.loads(db.model_dump_json())
+    for cluster in data["example_clusters"].values():
+        for source in cluster["canonical"]["sources"]:
+            source["line_count"] = 1
+    path = tmp_path / "db.json"
+    path.write_bytes(orjson.dumps(data))
+
+    restored = DedupDatabase.load_json(path)
+
+    assert restored.example_clusters["cluster_1"].canonical.sources[0].file == "a.md"
+
+
+# =============================================================================
+# Pyramid Index
+# =============================================================================
+
+
+def test_pyramid_save_load_round_trip(tmp_path):
+    """A saved pyramid index loads back with the same entries."""
+    db = DedupDatabase()
+    db.add_example_cluster(_cluster())
+    pyramid = PyramidIndex(apex=ApexIndex())
+    pyramid.build_from_database(db)
+
+    pyramid.save(tmp_path)
+    restored = PyramidIndex.load(tmp_path)
+
+    assert restored.canonicals == pyramid.canonicals
+    assert restored.clusters == pyramid.clusters
+    assert restored.apex.operations == pyramid.apex.operations
+    assert restored.apex.quick_stats["most_common"] == ["connect"]
+
+
+def test_apex_index_validates_operation_entries():
+    """OperationIndex constraints are checked by the enclosing ApexIndex."""
+    apex = ApexIndex()
+    cluster = _cluster()
+    apex.add_operation("connect", cluster.canonical.id, cluster)
+    data = orjson.loads(apex.model_dump_json())
+    data["operations"]["connect"]["total_occurrences"] = 0
+
+    with pytest.raises(ValidationError):
+        ApexIndex.model_validate(data)
+
+
+def test_variant_tier_entries_copy_unique_information():
+    """Tier entries do not share lists with the source variants."""
+    cluster = _cluster()
+    cluster.variants[0].unique_information.append("uses an explicit host")
+
+    variant_cluster = VariantCluster.from_example_cluster(cluster, "connect")
+    variant_cluster.tiers["a1"][0]["unique_information"].append("changed")
+
+    assert cluster.variants[0].unique_information == ["uses an explicit host"]
+
+
+def test_most_common_keeps_sorted_order_for_ties():
+    """The top 10 operations match a stable descending sort."""
+    db = DedupDatabase()
+    counts = [1, 4, 1, 4, 5, 5, 3, 3, 4, 2, 5, 1, 2, 2, 4, 2]
+    for i, count in enumerate(counts):
+        cluster = _cluster(cluster_id=f"cluster_{i}", operation=f"op_{i}")
+        cluster.canonical.occurrence_count = count
+        db.add_example_cluster(cluster)
+    pyramid = PyramidIndex(apex=ApexIndex())
+
+    pyramid.build_from_database(db)
+
+    expected = sorted(range(len(counts)), key=lambda i: counts[i], reverse=True)[:10]
+    assert pyramid.apex.quick_stats["most_common"] == [f"op_{i}" for i in expected]